@@ -6,16 +6,30 @@ from typing import Sequence
 class Video:
     """A class used to represent a Video."""
 
+    __slots__ = ("_title", "_video_id", "_flag_reason", "_flagged",
+                 "_flag_suffix", "_tags", "_title_lower", "_tags_lower",
+                 "_formatted_info")
+
     def __init__(self, video_title: str, video_id: str, video_tags: Sequence[str]):
         """Video constructor."""
         self._title = video_title
         self._video_id = video_id
         self._flag_reason = ""
+        self._flagged = False
+        self._flag_suffix = ""
 
         # Turn the tags into a tuple here so it's unmodifiable,
         # in case the caller changes the 'video_tags' they passed to us
         self._tags = tuple(video_tags)
 
+        # Lower case copies used by the case insensitive searches.
+        self._title_lower = video_title.lower()
+        self._tags_lower = tuple(tag.lower() for tag in self._tags)
+
+        # Everything shown here is immutable, so the formatted info is
+        # only built once.
+        self._formatted_info = f"{video_title} ({video_id}) [{' '.join(self._tags)}]"
+
     @property
     def title(self) -> str:
         """Returns the title of a video."""
@@ -31,16 +45,46 @@ class Video:
         """Returns the list of tags of a video."""
         return self._tags
 
+    @property
+    def title_lower(self) -> str:
+        """Returns the lower case title of a video."""
+        return self._title_lower
+
+    @property
+    def tags_lower(self) -> Sequence[str]:
+        """Returns the lower case tags of a video."""
+        return self._tags_lower
+
+    @property
+    def formatted_info(self) -> str:
+        """Returns the title, video id and tags of a video formatted for
+        display."""
+        return self._formatted_info
+
+    @property
+    def flagged(self) -> bool:
+        """Returns whether the video is flagged."""
+        return self._flagged
+
+    @property
+    def flag_suffix(self) -> str:
+        """Returns the flag status appended to the video info in listings,
+        empty if the video is not flagged."""
+        return self._flag_suffix
+
     @property
     def flag_reason(self) -> str:
-        """Returns the video id of a video."""
+        """Returns the flag reason of a video."""
         return self._flag_reason
 
     @flag_reason.setter
     def flag_reason(self, reason: str):
-        """Sets the flag reason to the passed string
+        """Sets the flag reason to the passed string, an empty reason
+        removes the flag
         
         Args:
             reason: string to set the flag_reason to
         """
         self._flag_reason = reason
+        self._flagged = reason != ""
+        self._flag_suffix = f" - FLAGGED (reason: {reason})" if self._flagged else ""
@@ -1,8 +1,17 @@
 """A video library class."""
 
 from .video import Video
+from bisect import bisect_right
+from collections import defaultdict
+from operator import attrgetter
 from pathlib import Path
+from types import MappingProxyType
 import csv
+import sys
+
+
+# Sort key for ordering videos by title.
+_TITLE = attrgetter("title")
 
 
 # Helper Wrapper around CSV reader to strip whitespace from around
@@ -14,6 +23,10 @@ def _csv_reader_with_strip(reader):
 class VideoLibrary:
     """A class used to represent a Video Library."""
 
+    # Libraries with more videos than this are searched through the
+    # title index instead of checking every title in turn.
+    _TITLE_INDEX_THRESHOLD = 1024
+
     def __init__(self):
         """The VideoLibrary class is initialized."""
         self._videos = {}
@@ -22,19 +35,44 @@ class VideoLibrary:
                 csv.reader(video_file, delimiter="|"))
             for video_info in reader:
                 title, url, tags = video_info
+                # Video ids are interned, so the dictionary lookups keyed
+                # on them can compare by identity.
+                url = sys.intern(url)
                 self._videos[url] = Video(
                     title,
                     url,
                     [tag.strip() for tag in tags.split(",")] if tags else [],
                 )
+        # The library is immutable after loading, so the title ordering
+        # only needs to be computed once.
+        self._videos_by_title = tuple(
+            sorted(self._videos.values(), key=_TITLE))
+        # Lower case tag -> videos with that tag, in library order.
+        self._videos_by_tag = defaultdict(list)
+        for video in self._videos.values():
+            for tag in dict.fromkeys(video.tags_lower):
+                self._videos_by_tag[tag].append(video)
+        # Built on the first search of a large library.
+        self._title_index = None
 
     def get_all_videos(self):
         """Returns all available video information from the video library."""
         return list(self._videos.values())
 
+    def sorted_by_title(self):
+        """Returns all videos from the video library sorted by title."""
+        return self._videos_by_title
+
+    @property
+    def videos_by_id(self):
+        """Returns a read only mapping of video ids to Video objects."""
+        return MappingProxyType(self._videos)
+
     def get_video(self, video_id):
         """Returns the video object (title, url, tags) from the video library.
 
+        The video ids of the returned videos are interned strings.
+
         Args:
             video_id: The video url.
 
@@ -43,3 +81,65 @@ class VideoLibrary:
             does not exist.
         """
         return self._videos.get(video_id, None)
+
+    def by_tag(self, video_tag):
+        """Returns the videos that have the given tag.
+
+        Args:
+            video_tag: The lower case tag.
+
+        Returns:
+            The Video objects with the tag, in library order. An empty
+            sequence if no video has the tag.
+        """
+        return self._videos_by_tag.get(video_tag, ())
+
+    def search_titles(self, search_term):
+        """Returns the videos whose titles contain the search term.
+
+        Args:
+            search_term: The lower case query to look for in the titles.
+
+        Returns:
+            The matching Video objects, sorted by title.
+        """
+        if len(self._videos) <= self._TITLE_INDEX_THRESHOLD:
+            return [video for video in self._videos_by_title
+                    if search_term in video.title_lower]
+        if not search_term:
+            return list(self._videos_by_title)
+        if "\n" in search_term:
+            return []
+        if self._title_index is None:
+            self._title_index = self._build_title_index()
+        haystack, starts, videos = self._title_index
+        matching_videos = []
+        position = haystack.find(search_term)
+        while position != -1:
+            index = bisect_right(starts, position) - 1
+            matching_videos.append(videos[index])
+            if index + 1 == len(starts):
+                break
+            position = haystack.find(search_term, starts[index + 1])
+        return matching_videos
+
+    def _build_title_index(self):
+        """Joins all lower case titles into a single newline separated
+        string, so a search is a handful of str.find calls instead of a
+        Python level loop over every video.
+
+        The titles are laid out in title order, so the matches come out
+        already sorted.
+
+        Returns:
+            The joined titles, the offset each title starts at and the
+            videos in the same order.
+        """
+        videos = self._videos_by_title
+        starts = []
+        offset = 0
+        for video in videos:
+            starts.append(offset)
+            offset += len(video.title_lower) + 1
+        haystack = "\n".join(video.title_lower for video in videos)
+        return haystack, starts, videos
@@ -1,26 +1,74 @@
 """A video player class."""
 
+import bisect
+import functools
 import random
+import sys
+from enum import IntEnum
+from operator import attrgetter
 from .video_library import VideoLibrary
 from .video_playlist import Playlist
 from .command_parser import CommandException
 from .command_parser import CommandParser
 
+# Number of picks from the whole library play_random_video makes before
+# falling back to choosing among the non flagged videos only.
+_RANDOM_VIDEO_ATTEMPTS = 8
+
+# Sort key for ordering videos by title.
+_TITLE = attrgetter("title")
+
+# Error messages shared by the playlist commands.
+_ERR_NO_PLAYLIST = "Cannot {action} {name}: Playlist does not exist".format
+_ERR_NO_PLAYLIST_VIDEO = "Cannot {action} {name}: Video does not exist".format
+
+_PLAY_PROMPT = ("Would you like to play any of the above? If yes, specify the number of the video.\n"
+                " If your answer is not a valid number, we will assume it's a no.")
+
+
+@functools.lru_cache(maxsize=128)
+def _fold(playlist_name):
+    """Returns the case folded playlist name the playlists are keyed on.
+
+    Args:
+        playlist_name: the playlist name as typed by the user
+    """
+    return playlist_name.casefold()
+
+
+class PlayerState(IntEnum):
+    """The playback state of the video player."""
+    STOPPED = 0
+    PLAYING = 1
+    PAUSED = 2
+
+
+def _print_lines(lines):
+    """Prints the passed lines with a single write to stdout.
+
+    Args:
+        lines: the lines to be printed, without trailing newlines
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 class VideoPlayer:
     """A class used to represent a Video Player."""
 
     def __init__(self):
         self._video_library = VideoLibrary()
+        # Bound once so looking up a video id is a single mapping access.
+        self._videos_by_id = self._video_library.videos_by_id
         self._currently_playing_video = None
-        self._current_video_status = None
+        self._state = PlayerState.STOPPED
         self._all_playlists = {}
+        # Case folded playlist names kept in sorted order, so that listing
+        # the playlists does not need to sort them every time.
+        self._sorted_playlist_names = []
         self._parser = CommandParser(self)
 
     def formatted_video_info(self, video):
-        video_title = video.title
-        video_id = video.video_id
-        video_tags = " ".join(video.tags)
-        return f"{video_title} ({video_id}) [{video_tags}]"
+        return video.formatted_info
 
     def number_of_videos(self):
         num_videos = len(self._video_library.get_all_videos())
@@ -28,14 +76,10 @@ class VideoPlayer:
 
     def show_all_videos(self):
         """Returns all videos."""
-        all_videos = self._video_library.get_all_videos()
-        all_videos = sorted(all_videos, key = lambda x : x.title)
-        print("Here's a list of all available videos:")
-        for video in all_videos:
-            video_flag_status = ""
-            if video.flag_reason != "":
-                video_flag_status = f" - FLAGGED (reason: {video.flag_reason})"
-            print(f"{self.formatted_video_info(video)}{video_flag_status}")
+        lines = ["Here's a list of all available videos:"]
+        for video in self._video_library.sorted_by_title():
+            lines.append(f"{self.formatted_video_info(video)}{video.flag_suffix}")
+        _print_lines(lines)
 
     def play_video(self, video_id: str):
         """Plays the respective video.
@@ -43,32 +87,43 @@ class VideoPlayer:
         Args:
             video_id: The video_id to be played.
         """
-        video_to_play = self._video_library.get_video(video_id)
+        video_to_play = self._videos_by_id.get(video_id)
         if video_to_play is None:
             print("Cannot play video: Video does not exist")
             return
-        if video_to_play.flag_reason != "":
+        if video_to_play.flagged:
             print(f"Cannot play video: Video is currently flagged (reason: {video_to_play.flag_reason})")
             return
-        if self._currently_playing_video is not None:
+        if self._state is not PlayerState.STOPPED:
             print(f"Stopping video: {self._currently_playing_video.title}")
         print(f"Playing video: {video_to_play.title}")
         self._currently_playing_video = video_to_play
-        self._current_video_status = 1
+        self._state = PlayerState.PLAYING
 
     def stop_video(self):
         """Stops the current video."""
-        if self._currently_playing_video is None:
+        if self._state is PlayerState.STOPPED:
             print("Cannot stop video: No video is currently playing")
             return 
         print(f"Stopping video: {self._currently_playing_video.title}")
         self._currently_playing_video = None
-        self._current_video_status = None
+        self._state = PlayerState.STOPPED
 
     def play_random_video(self):
         """Plays a random video from the video library."""
-        all_videos = self._video_library.get_all_videos()
-        non_flagged_videos = [video for video in all_videos if video.flag_reason == ""]
+        # Any fixed ordering will do here, and this one is not copied.
+        all_videos = self._video_library.sorted_by_title()
+        if not all_videos:
+            print("No videos available")
+            return
+        # Usually few videos are flagged, so try picking from all videos
+        # first and only build the non flagged list if that keeps failing.
+        for _ in range(_RANDOM_VIDEO_ATTEMPTS):
+            random_video = random.choice(all_videos)
+            if not random_video.flagged:
+                self.play_video(random_video.video_id)
+                return
+        non_flagged_videos = [video for video in all_videos if not video.flagged]
         if len(non_flagged_videos) == 0:
             print("No videos available")
             return
@@ -77,33 +132,33 @@ class VideoPlayer:
 
     def pause_video(self):
         """Pauses the current video."""
-        if self._currently_playing_video is None:
+        if self._state is PlayerState.STOPPED:
             print("Cannot pause video: No video is currently playing")
         else:
-            if self._current_video_status == 0:
+            if self._state is PlayerState.PAUSED:
                 print(f"Video already paused: {self._currently_playing_video.title}")
             else:
-                self._current_video_status = 0
+                self._state = PlayerState.PAUSED
                 print(f"Pausing video: {self._currently_playing_video.title}")
 
     def continue_video(self):
         """Resumes playing the current video."""
-        if self._currently_playing_video is None:
+        if self._state is PlayerState.STOPPED:
             print("Cannot continue video: No video is currently playing")
         else:
-            if self._current_video_status == 1:
+            if self._state is PlayerState.PLAYING:
                 print("Cannot continue video: Video is not paused")
             else:
-                self._current_video_status = 1
+                self._state = PlayerState.PLAYING
                 print(f"Continuing video: {self._currently_playing_video.title}")
 
     def show_playing(self):
         """Displays video currently playing."""
-        if self._currently_playing_video is None:
+        if self._state is PlayerState.STOPPED:
             print("No video is currently playing")
         else:
             current_video_info = self.formatted_video_info(self._currently_playing_video)
-            if self._current_video_status == 0:
+            if self._state is PlayerState.PAUSED:
                 current_video_info = current_video_info + " - PAUSED"
             print(f"Currently playing: {current_video_info}")
 
@@ -113,12 +168,13 @@ class VideoPlayer:
         Args:
             playlist_name: The playlist name.
         """
-        lower_case_playlist_name = playlist_name.lower()
+        lower_case_playlist_name = _fold(playlist_name)
         if lower_case_playlist_name in self._all_playlists:
             print("Cannot create playlist: A playlist with the same name already exists.")
         else:
             new_playlist = Playlist(playlist_name)
             self._all_playlists[lower_case_playlist_name] = new_playlist
+            bisect.insort(self._sorted_playlist_names, lower_case_playlist_name)
             print(f"Successfully created new playlist: {playlist_name}")
 
     def add_to_playlist(self, playlist_name: str, video_id: str):
@@ -128,23 +184,21 @@ class VideoPlayer:
             playlist_name: The playlist name.
             video_id: The video_id to be added.
         """
-        lower_case_playlist_name = playlist_name.lower()
+        lower_case_playlist_name = _fold(playlist_name)
         if lower_case_playlist_name not in self._all_playlists:
-            print(f"Cannot add video to {playlist_name}: Playlist does not exist")
+            print(_ERR_NO_PLAYLIST(action="add video to", name=playlist_name))
             return
-        video_to_add = self._video_library.get_video(video_id)
+        video_to_add = self._videos_by_id.get(video_id)
         if video_to_add is None:
-            print(f"Cannot add video to {playlist_name}: Video does not exist")
+            print(_ERR_NO_PLAYLIST_VIDEO(action="add video to", name=playlist_name))
         else:
-            if video_to_add.flag_reason != "":
+            if video_to_add.flagged:
                 print(f"Cannot add video to {playlist_name}: Video is currently flagged (reason: {video_to_add.flag_reason})")
                 return
-            playlist_videos = self._all_playlists[lower_case_playlist_name].videos
-            if video_id in playlist_videos:
-                print(f"Cannot add video to {playlist_name}: Video already added")
-            else:
-                self._all_playlists[lower_case_playlist_name].add_video(video_to_add)
+            if self._all_playlists[lower_case_playlist_name].add_video(video_to_add):
                 print(f"Added video to {playlist_name}: {video_to_add.title}")
+            else:
+                print(f"Cannot add video to {playlist_name}: Video already added")
 
     def show_all_playlists(self):
         """Display all playlists."""
@@ -152,8 +206,8 @@ class VideoPlayer:
             print("No playlists exist yet")
             return
         print("Showing all playlists:")
-        for playlist in sorted(self._all_playlists.values(), key = lambda x : x.title):
-            print(f"  {playlist.title}")
+        for lower_case_playlist_name in self._sorted_playlist_names:
+            print(f"  {self._all_playlists[lower_case_playlist_name].title}")
 
     def show_playlist(self, playlist_name: str):
         """Display all videos in a playlist with a given name.
@@ -161,20 +215,17 @@ class VideoPlayer:
         Args:
             playlist_name: The playlist name.
         """
-        lower_case_playlist_name = playlist_name.lower()
+        lower_case_playlist_name = _fold(playlist_name)
         if lower_case_playlist_name not in self._all_playlists:
-            print(f"Cannot show playlist {playlist_name}: Playlist does not exist")
+            print(_ERR_NO_PLAYLIST(action="show playlist", name=playlist_name))
             return
-        print(f"Showing playlist: {playlist_name}")
+        lines = [f"Showing playlist: {playlist_name}"]
         required_playlist = self._all_playlists[lower_case_playlist_name]
         if not required_playlist.videos:
-            print("  No videos here yet")
-            return
-        for video_id, video in required_playlist.videos.items():
-            video_flag_status = ""
-            if video.flag_reason != "":
-                video_flag_status = f" - FLAGGED (reason: {video.flag_reason})"
-            print(f"{self.formatted_video_info(video)}{video_flag_status}")
+            lines.append("  No videos here yet")
+        for video in required_playlist.videos.values():
+            lines.append(f"{self.formatted_video_info(video)}{video.flag_suffix}")
+        _print_lines(lines)
 
     def remove_from_playlist(self, playlist_name: str, video_id: str):
         """Removes a video to a playlist with a given name.
@@ -183,13 +234,13 @@ class VideoPlayer:
             playlist_name: The playlist name.
             video_id: The video_id to be removed.
         """
-        lower_case_playlist_name = playlist_name.lower()
+        lower_case_playlist_name = _fold(playlist_name)
         if lower_case_playlist_name not in self._all_playlists:
-            print(f"Cannot remove video from {playlist_name}: Playlist does not exist")
+            print(_ERR_NO_PLAYLIST(action="remove video from", name=playlist_name))
             return
-        video_to_add = self._video_library.get_video(video_id)
+        video_to_add = self._videos_by_id.get(video_id)
         if video_to_add is None:
-            print(f"Cannot remove video from {playlist_name}: Video does not exist")
+            print(_ERR_NO_PLAYLIST_VIDEO(action="remove video from", name=playlist_name))
         else:
             playlist_videos = self._all_playlists[lower_case_playlist_name].videos
             if video_id not in playlist_videos:
@@ -204,9 +255,9 @@ class VideoPlayer:
         Args:
             playlist_name: The playlist name.
         """
-        lower_case_playlist_name = playlist_name.lower()
+        lower_case_playlist_name = _fold(playlist_name)
         if lower_case_playlist_name not in self._all_playlists:
-            print(f"Cannot clear playlist {playlist_name}: Playlist does not exist")
+            print(_ERR_NO_PLAYLIST(action="clear playlist", name=playlist_name))
             return
         self._all_playlists[lower_case_playlist_name].reset_playlist()
         print(f"Successfully removed all videos from {playlist_name}")
@@ -217,11 +268,13 @@ class VideoPlayer:
         Args:
             playlist_name: The playlist name.
         """
-        lower_case_playlist_name = playlist_name.lower()
+        lower_case_playlist_name = _fold(playlist_name)
         if lower_case_playlist_name not in self._all_playlists:
-            print(f"Cannot delete playlist {playlist_name}: Playlist does not exist")
+            print(_ERR_NO_PLAYLIST(action="delete playlist", name=playlist_name))
             return
         self._all_playlists.pop(lower_case_playlist_name)
+        index = bisect.bisect_left(self._sorted_playlist_names, lower_case_playlist_name)
+        del self._sorted_playlist_names[index]
         print(f"Deleted playlist: {playlist_name}")
 
     def search_videos(self, search_term: str):
@@ -230,19 +283,18 @@ class VideoPlayer:
         Args:
             search_term: The query to be used in search.
         """
-        all_videos = self._video_library.get_all_videos()
-        matching_videos = []
-        for video in all_videos:
-            if video.flag_reason == "" and search_term.lower() in video.title.lower():
-                matching_videos.append(video)
+        lower_case_search_term = search_term.lower()
+        # The library returns the matches already sorted by title.
+        matching_videos = [video for video in self._video_library.search_titles(lower_case_search_term)
+                           if not video.flagged]
         if len(matching_videos) == 0:
             print(f"No search results for {search_term}")
             return
-        maching_videos = sorted(matching_videos, key = lambda x : x.title)
-        print(f"Here are the results for {search_term}:")
-        for number, video in enumerate(matching_videos):
-            print(f"{number+1}) {self.formatted_video_info(video)}")
-        print("Would you like to play any of the above? If yes, specify the number of the video.\n If your answer is not a valid number, we will assume it's a no.")
+        lines = [f"Here are the results for {search_term}:"]
+        lines.extend(f"{number+1}) {self.formatted_video_info(video)}"
+                     for number, video in enumerate(matching_videos))
+        lines.append(_PLAY_PROMPT)
+        _print_lines(lines)
         command = input()
         try:
             self._parser.process_command(command, matching_videos)
@@ -255,23 +307,18 @@ class VideoPlayer:
         Args:
             video_tag: The video tag to be used in search.
         """
-        all_videos = self._video_library.get_all_videos()
-        matching_videos = []
-        for video in all_videos:
-            if video.flag_reason != "":
-                continue
-            for tag in video.tags:
-                if video_tag.lower() == tag.lower():
-                    matching_videos.append(video)
-                    break
+        matching_videos = [video for video in self._video_library.by_tag(video_tag.lower())
+                           if not video.flagged]
         if len(matching_videos) == 0:
             print(f"No search results for {video_tag}")
             return
-        maching_videos = sorted(matching_videos, key = lambda x : x.title)
-        print(f"Here are the results for {video_tag}:")
-        for number, video in enumerate(matching_videos):
-            print(f"{number+1}) {self.formatted_video_info(video)}")
-        print("Would you like to play any of the above? If yes, specify the number of the video.\n If your answer is not a valid number, we will assume it's a no.")
+        if len(matching_videos) > 1:
+            matching_videos.sort(key=_TITLE)
+        lines = [f"Here are the results for {video_tag}:"]
+        lines.extend(f"{number+1}) {self.formatted_video_info(video)}"
+                     for number, video in enumerate(matching_videos))
+        lines.append(_PLAY_PROMPT)
+        _print_lines(lines)
         command = input()
         try:
             self._parser.process_command(command, matching_videos)
@@ -285,13 +332,13 @@ class VideoPlayer:
             video_id: The video_id to be flagged.
             flag_reason: Reason for flagging the video.
         """
-        video_to_flag = self._video_library.get_video(video_id)
+        video_to_flag = self._videos_by_id.get(video_id)
         if video_to_flag is None:
             print("Cannot flag video: Video does not exist")
-        elif video_to_flag.flag_reason != "":
+        elif video_to_flag.flagged:
             print("Cannot flag video: Video is already flagged")
         else:
-            if self._currently_playing_video is not None and video_id == self._currently_playing_video.video_id:
+            if self._state is not PlayerState.STOPPED and video_id == self._currently_playing_video.video_id:
                 self.stop_video()
             video_to_flag.flag_reason = flag_reason if flag_reason != "" else "Not supplied"
             print(f"Successfully flagged video: {video_to_flag.title} (reason: {video_to_flag.flag_reason})")
@@ -302,10 +349,10 @@ class VideoPlayer:
         Args:
             video_id: The video_id to be allowed again.
         """
-        video_to_unflag = self._video_library.get_video(video_id)
+        video_to_unflag = self._videos_by_id.get(video_id)
         if video_to_unflag is None:
             print("Cannot remove flag from video: Video does not exist")
-        elif video_to_unflag.flag_reason == "":
+        elif not video_to_unflag.flagged:
             print("Cannot remove flag from video: Video is not flagged")
         else:
             video_to_unflag.flag_reason = ""
@@ -3,6 +3,8 @@ from typing import Dict
 from .video import Video
 class Playlist:
     """A class used to represent a Playlist."""
+    __slots__ = ("_title", "_videos")
+
     def __init__(self, playlist_title: str):
         """Playlist constructor"""
         self._title = playlist_title
@@ -23,8 +25,16 @@ class Playlist:
         
         Args:
             video: the video to be added
+
+        Returns:
+            True if the video was added, False if it was already in the
+            playlist.
         """
-        self._videos[video.video_id] = video
+        # The library hands out the same Video objects every time, so
+        # whether the dictionary grew is what tells a new video apart.
+        size_before = len(self._videos)
+        self._videos.setdefault(video.video_id, video)
+        return len(self._videos) != size_before
 
     def remove_video(self, video):
         """Removes the passed video from the videos dictionary
@@ -36,7 +46,7 @@ class Playlist:
 
     def reset_playlist(self):
         """Resets the videos dictionary, hence the playlist"""
-        self._videos = {}
+        self._videos.clear()
 
     def get_all_videos(self):
         """returns the dictionary of videos"""
@@ -235,3 +235,15 @@ def test_delete_playlist_nonexistent(capfd):
     lines = out.splitlines()
     assert len(lines) == 1
     assert "Cannot delete playlist my_cool_playlist: Playlist does not exist" in lines[0]
+
+
+def test_create_existing_playlist_case_folded(capfd):
+    player = VideoPlayer()
+    player.create_playlist("straße_playlist")
+    player.create_playlist("STRASSE_PLAYLIST")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 2
+    assert "Successfully created new playlist: straße_playlist" in lines[0]
+    assert ("Cannot create playlist: A playlist with the same name already "
+            "exists") in lines[1]
@@ -140,3 +140,28 @@ def test_search_videos_tag_no_results(capfd):
     lines = out.splitlines()
     assert len(lines) == 1
     assert "No search results for #blah" in lines[0]
+
+
+@mock.patch('builtins.input', lambda *args: 'No')
+def test_search_videos_sorted_by_title(capfd):
+    player = VideoPlayer()
+    player.search_videos("o")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 7
+    assert "1) Another Cat Video (another_cat_video_id) [#cat #animal]" in lines[1]
+    assert "2) Funny Dogs (funny_dogs_video_id) [#dog #animal]" in lines[2]
+    assert "3) Life at Google (life_at_google_video_id) [#google #career]" in lines[3]
+    assert "4) Video about nothing (nothing_video_id) []" in lines[4]
+
+
+@mock.patch('builtins.input', lambda *args: 'No')
+def test_search_videos_with_tag_sorted_by_title(capfd):
+    player = VideoPlayer()
+    player.search_videos_tag("#animal")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 6
+    assert "1) Amazing Cats (amazing_cats_video_id) [#cat #animal]" in lines[1]
+    assert "2) Another Cat Video (another_cat_video_id) [#cat #animal]" in lines[2]
+    assert "3) Funny Dogs (funny_dogs_video_id) [#dog #animal]" in lines[3]
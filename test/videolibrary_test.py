@@ -1,3 +1,5 @@
+import sys
+
 from src.video_library import VideoLibrary
 
 
@@ -24,3 +26,57 @@ def test_parses_video_correctly_without_tags():
     assert video.title == "Video about nothing"
     assert video.video_id == "nothing_video_id"
     assert video.tags == ()
+
+
+def test_sorted_by_title():
+    library = VideoLibrary()
+    titles = [video.title for video in library.sorted_by_title()]
+
+    assert titles == sorted(video.title for video in library.get_all_videos())
+
+
+def test_search_titles():
+    library = VideoLibrary()
+    titles = [video.title for video in library.search_titles("o")]
+
+    assert titles == ["Another Cat Video", "Funny Dogs", "Life at Google",
+                      "Video about nothing"]
+
+
+def test_search_titles_with_index():
+    library = VideoLibrary()
+    library._TITLE_INDEX_THRESHOLD = 0
+
+    assert [video.title for video in library.search_titles("cat")] == [
+        "Amazing Cats", "Another Cat Video"]
+    assert [video.title for video in library.search_titles("o")] == [
+        "Another Cat Video", "Funny Dogs", "Life at Google",
+        "Video about nothing"]
+    assert library.search_titles("blah") == []
+    assert len(library.search_titles("")) == 5
+
+
+def test_by_tag():
+    library = VideoLibrary()
+    titles = [video.title for video in library.by_tag("#cat")]
+
+    assert titles == ["Amazing Cats", "Another Cat Video"]
+    assert list(library.by_tag("#CAT")) == []
+    assert list(library.by_tag("#nonexistent")) == []
+
+
+def test_video_ids_are_interned():
+    library = VideoLibrary()
+    video = library.get_video("amazing_cats_video_id")
+
+    assert video.video_id is sys.intern("amazing_cats_video_id")
+
+
+def test_videos_by_id():
+    library = VideoLibrary()
+    videos_by_id = library.videos_by_id
+
+    assert len(videos_by_id) == 5
+    assert videos_by_id["amazing_cats_video_id"] is library.get_video(
+        "amazing_cats_video_id")
+    assert videos_by_id.get("nonexistent_video_id") is None